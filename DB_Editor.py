@@ -8,20 +8,79 @@ st.set_page_config(
 )
 
 import pandas as pd
-from supabase import create_client, Client
+import numpy as np
+import pyarrow as pa
 import re
-import traceback
+import logging
 import bcrypt
 import uuid
 import os
 import json
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from postgrest.exceptions import APIError
+from streamlit.errors import StreamlitSecretNotFoundError
 import pytz  # Added for timezone support
 
 from login import login_form, get_user_session, logout
+from db import init_connection
 from language import setup_language_selector, get_text, load_translations
 
 taiwan_tz = pytz.timezone('Asia/Taipei')
+logger = logging.getLogger(__name__)
+
+# Show raw error details in the UI only when DEBUG is enabled in secrets.toml.
+# Without a secrets.toml this runs before the login form, so fall back to off
+try:
+    DEBUG = st.secrets.get("DEBUG", False)
+except StreamlitSecretNotFoundError:
+    DEBUG = False
+
+# --- Precompiled regex patterns ---
+MODEL_GROUP_INFIX_RE = re.compile(r'\d+([A-Z]+)\d+')
+MODEL_GROUP_PREFIX_RE = re.compile(r'^([A-Z]+)')
+SELECTION_DB_ID_RE = re.compile(r"ID: (\d+)")
+
+# --- Pump table and the columns used by the app ---
+PUMP_TABLE = "pump_selection_data"
+AUDIT_TABLE = "audit_trail"
+PUMP_COLUMNS = [
+    "DB ID", "Model No.", "Frequency_Hz", "Phase", "HP",
+    "Power(KW)", "Outlet (mm)", "Outlet (inch)", "Pass Solid Dia(mm)",
+    "Max Flow (LPM)", "Max Head (M)", "Max Head (ft)", "Category", "Product Link",
+    "Head Rated/M", "Q Rated/LPM"
+]
+# Column names contain spaces and punctuation, so quote them for PostgREST
+PUMP_SELECT = ",".join(f'"{column}"' for column in PUMP_COLUMNS)
+
+# Rows or DB IDs per request in bulk writes, keeping the in.(...) filter well inside URL limits
+BULK_CHUNK_SIZE = 200
+# Postgres error code for a duplicate key, and how often an insert retries with a fresh DB ID
+UNIQUE_VIOLATION = "23505"
+INSERT_ID_ATTEMPTS = 3
+
+# Fields stored as integers / floats in the database; everything else is text
+INT_FIELDS = frozenset({"Frequency_Hz", "Phase", "Outlet (mm)", "Pass Solid Dia(mm)"})
+FLOAT_FIELDS = frozenset({"Max Head (M)", "Head Rated/M", "Q Rated/LPM"})
+
+# Edit form layout: the columns shown in each form column, in display order
+EDIT_FORM_COLUMNS = (
+    ["Model No.", "Frequency_Hz", "Phase", "HP", "Power(KW)", "Outlet (mm)", "Outlet (inch)"],
+    ["Pass Solid Dia(mm)", "Max Flow (LPM)", "Max Head (M)", "Max Head (ft)", "Head Rated/M", "Q Rated/LPM", "Category", "Product Link"]
+)
+# Widget used for each Edit form column; anything not listed is a text input
+EDIT_WIDGET_KINDS = {
+    **dict.fromkeys(INT_FIELDS, "int"),
+    **dict.fromkeys(FLOAT_FIELDS, "float"),
+    "Category": "category"
+}
+
+# Arrow-backed dtypes for the pump columns (text unless numeric), applied when building DataFrames
+PUMP_DTYPES = {
+    **dict.fromkeys(PUMP_COLUMNS, "string[pyarrow]"),
+    **dict.fromkeys(["DB ID", *INT_FIELDS], "int64[pyarrow]"),
+    **dict.fromkeys(FLOAT_FIELDS, "double[pyarrow]")
+}
 
 # --- Set up language selector ---
 if 'translations' not in st.session_state:
@@ -41,21 +100,85 @@ with st.sidebar:
     if st.button(f"🚪 {get_text('logout')}"):
         logout()
 
-# --- Load Supabase credentials from secrets.toml ---
-@st.cache_resource(show_spinner=False)
-def init_connection():
-    try:
-        supabase_url = st.secrets["SUPABASE_URL"]
-        supabase_key = st.secrets["SUPABASE_KEY"]
-        return create_client(supabase_url, supabase_key)
-    except KeyError as e:
-        st.error(f"Missing required secret: {e}")
-        st.stop()
-    except Exception as e:
-        st.error(f"Failed to initialize Supabase connection: {e}")
-        st.stop()
+def pump_table():
+    """
+    Query builder for the pump table on the shared client. Builders are
+    single-use, so a fresh one is made per query; only the client is cached
+    """
+    return init_connection().table(PUMP_TABLE)
+
+def audit_table():
+    """Query builder for the audit trail table on the same shared client"""
+    return init_connection().table(AUDIT_TABLE)
 
 # --- Audit Trail/Version Control Functions ---
+def build_audit_record(table_name, record_id, operation, old_data=None, new_data=None, description=None):
+    """
+    Build an audit trail row for a change; see log_database_change for the parameters
+    """
+    # Get the current user from session
+    user = get_user_session()
+    
+    # Extract user info - handle different user object structures
+    if user:
+        # Try to get user email with different approaches based on the object structure
+        if isinstance(user, dict):
+            # If user is a dictionary
+            user_email = user.get('email', user.get('username', 'unknown'))
+        elif hasattr(user, 'email'):
+            # If user has email attribute
+            user_email = user.email
+        elif hasattr(user, 'username'):
+            # If user has username attribute
+            user_email = user.username
+        else:
+            # Use string representation as fallback
+            user_email = str(user)
+    else:
+        user_email = 'anonymous'
+    
+    # Convert numpy data types to Python native types to make them JSON serializable
+    def convert_to_serializable(obj):
+        if obj is None:
+            return None
+            
+        if isinstance(obj, dict):
+            return {k: convert_to_serializable(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_to_serializable(item) for item in obj]
+        # Handle numpy data types
+        elif hasattr(obj, 'dtype') and hasattr(obj, 'item'):
+            return obj.item()  # Convert numpy types to native Python types
+        elif pd.isna(obj):
+            return None
+        
+        # Try to convert to native Python types for any other object
+        try:
+            return float(obj) if isinstance(obj, float) else int(obj) if isinstance(obj, int) else str(obj)
+        except (ValueError, TypeError):
+            return str(obj)
+    
+    # Convert the data to JSON serializable format
+    clean_old_data = convert_to_serializable(old_data) if old_data else None
+    clean_new_data = convert_to_serializable(new_data) if new_data else None
+    
+    # Convert record_id to int if it's a numpy type
+    if hasattr(record_id, 'dtype') and hasattr(record_id, 'item'):
+        record_id = record_id.item()
+    
+    # Prepare the audit record using Taiwan timezone
+    return {
+        "id": str(uuid.uuid4()),
+        "table_name": table_name,
+        "record_id": record_id,
+        "operation": operation,
+        "old_data": json.dumps(clean_old_data) if clean_old_data else None,
+        "new_data": json.dumps(clean_new_data) if clean_new_data else None,
+        "modified_by": user_email,
+        "modified_at": datetime.now(taiwan_tz).isoformat(),  # Use Taiwan timezone
+        "description": description
+    }
+
 def log_database_change(table_name, record_id, operation, old_data=None, new_data=None, description=None):
     """
     Log changes to the database into an audit trail table
@@ -69,78 +192,17 @@ def log_database_change(table_name, record_id, operation, old_data=None, new_dat
     - description: Optional description of the change
     """
     try:
-        # Get the current user from session
-        user = get_user_session()
-        
-        # Extract user info - handle different user object structures
-        if user:
-            # Try to get user email with different approaches based on the object structure
-            if isinstance(user, dict):
-                # If user is a dictionary
-                user_email = user.get('email', user.get('username', 'unknown'))
-            elif hasattr(user, 'email'):
-                # If user has email attribute
-                user_email = user.email
-            elif hasattr(user, 'username'):
-                # If user has username attribute
-                user_email = user.username
-            else:
-                # Use string representation as fallback
-                user_email = str(user)
-        else:
-            user_email = 'anonymous'
-        
-        # Convert numpy data types to Python native types to make them JSON serializable
-        def convert_to_serializable(obj):
-            if obj is None:
-                return None
-                
-            if isinstance(obj, dict):
-                return {k: convert_to_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_serializable(item) for item in obj]
-            # Handle numpy data types
-            elif hasattr(obj, 'dtype') and hasattr(obj, 'item'):
-                return obj.item()  # Convert numpy types to native Python types
-            elif pd.isna(obj):
-                return None
-            
-            # Try to convert to native Python types for any other object
-            try:
-                return float(obj) if isinstance(obj, float) else int(obj) if isinstance(obj, int) else str(obj)
-            except (ValueError, TypeError):
-                return str(obj)
-        
-        # Convert the data to JSON serializable format
-        clean_old_data = convert_to_serializable(old_data) if old_data else None
-        clean_new_data = convert_to_serializable(new_data) if new_data else None
-        
-        # Convert record_id to int if it's a numpy type
-        if hasattr(record_id, 'dtype') and hasattr(record_id, 'item'):
-            record_id = record_id.item()
-        
-        # Prepare the audit record using Taiwan timezone
-        audit_record = {
-            "id": str(uuid.uuid4()),
-            "table_name": table_name,
-            "record_id": record_id,
-            "operation": operation,
-            "old_data": json.dumps(clean_old_data) if clean_old_data else None,
-            "new_data": json.dumps(clean_new_data) if clean_new_data else None,
-            "modified_by": user_email,
-            "modified_at": datetime.now(taiwan_tz).isoformat(),  # Use Taiwan timezone
-            "description": description
-        }
+        audit_record = build_audit_record(table_name, record_id, operation, old_data, new_data, description)
         
         # Insert into audit_trail table
-        response = supabase.table("audit_trail").insert(audit_record).execute()
+        response = audit_table().insert(audit_record).execute()
         
         # Log success for debugging
-        print(f"Audit trail entry created for {operation} on {table_name} (ID: {record_id})")
+        logger.debug("Audit trail entry created for %s on %s (ID: %s)", operation, table_name, record_id)
         return True
     except Exception as e:
         st.error(f"Failed to create audit trail entry: {e}")
-        st.error(traceback.format_exc())
+        logger.exception("Failed to create audit trail entry")
         return False
 
 # --- Realtime Updates Component ---
@@ -159,9 +221,9 @@ def setup_realtime_updates():
     # Function to fetch recent changes
     def fetch_recent_changes():
         try:
-            # Get changes since last check
-            response = supabase.table("audit_trail") \
-                .select("*") \
+            # Get changes since last check; the feed never shows the old/new JSON snapshots
+            response = audit_table() \
+                .select("operation,table_name,record_id,modified_by,modified_at") \
                 .gte("modified_at", st.session_state.last_check.isoformat()) \
                 .order("modified_at", desc=True) \
                 .limit(10) \
@@ -256,54 +318,143 @@ def get_table_schema():
     """Get the table schema by fetching a sample record and examining its structure"""
     try:
         # Get one record to understand the schema
-        sample_response = supabase.table("pump_selection_data").select("*").limit(1).execute()
+        sample_response = pump_table().select("*").limit(1).execute()
         
         if sample_response.data:
             sample_record = sample_response.data[0]
             return list(sample_record.keys())
         else:
             # If no data, return a default schema based on what we know
-            return [
-                "DB ID", "Model No.", "Frequency (Hz)", "Phase", "HP", 
-                "Power(KW)", "Outlet (mm)", "Outlet (inch)", "Pass Solid Dia(mm)",
-                "Max Flow (LPM)", "Max Head (M)", "Max Head (ft)", "Category", "Product Link"
-            ]
+            return list(PUMP_COLUMNS)
     except Exception as e:
         st.error(f"Error getting table schema: {e}")
         return []
 
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
 def fetch_all_pump_data():
-    all_data = []
-    page_size = 1000  # Supabase typically has a limit of 1000 rows per request
+    # The client comes from the cached resource, so it is not part of the cache key
+    # Each batch is converted to columns as soon as it arrives, so the JSON rows can be freed
+    frames = []
+    # Rows per request. Supabase caps responses at the project's max-rows setting
+    # (1000 by default); raise SUPABASE_MAX_ROWS alongside it to load the table in one request
+    page_size = int(st.secrets.get("SUPABASE_MAX_ROWS", 1000))
+    
+    # Resolve the shared client once; the batch threads have no Streamlit script context
+    client = init_connection()
     
-    # Get total count first
-    count_response = supabase.table("pump_selection_data").select("count", count="exact").execute()
-    total_count = count_response.count if hasattr(count_response, 'count') else 0
+    def fetch_batch(start_idx):
+        # Order by DB ID to ensure consistent sorting
+        return client.table(PUMP_TABLE).select(PUMP_SELECT).order('"DB ID"').range(start_idx, start_idx + page_size - 1).execute().data
     
-    if total_count == 0:
+    # Fetch the first batch with an estimated count; Postgres answers it from planner
+    # statistics instead of counting every row
+    response = client.table(PUMP_TABLE).select(PUMP_SELECT, count="estimated").order('"DB ID"').range(0, page_size - 1).execute()
+    if not response.data:
         return pd.DataFrame()
     
+    frames.append(rows_to_dataframe(response.data))
+    loaded = last_batch_size = len(response.data)
+    total_count = max(response.count or 0, loaded)
+    
+    # A project max-rows cap below SUPABASE_MAX_ROWS shortens every response, so step
+    # by what the server actually returned; otherwise the rows in between are skipped
+    if loaded < page_size and total_count > loaded:
+        page_size = loaded
+    
     # Show progress
     progress_text = get_text("fetching_data")
-    progress_bar = st.progress(0, text=progress_text)
+    progress_bar = st.progress(min(loaded / total_count, 1.0), text=f"{progress_text} ({loaded}/{total_count})")
     
-    # Fetch in batches with sorting by DB ID
-    for start_idx in range(0, total_count, page_size):
-        with st.spinner(get_text("loading_records", start_idx+1, min(start_idx+page_size, total_count))):
-            # Order by DB ID to ensure consistent sorting
-            response = supabase.table("pump_selection_data").select("*").order('"DB ID"').range(start_idx, start_idx + page_size - 1).execute()
-            
-            if response.data:
-                all_data.extend(response.data)
+    # Fetch the remaining estimated batches concurrently; map keeps them in DB ID order
+    offsets = range(page_size, total_count, page_size)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for batch in executor.map(fetch_batch, offsets):
+            if batch:
+                frames.append(rows_to_dataframe(batch))
+            loaded += len(batch)
+            last_batch_size = len(batch)
             
             # Update progress
-            progress = min((start_idx + page_size) / total_count, 1.0)
-            progress_bar.progress(progress, text=f"{progress_text} ({len(all_data)}/{total_count})")
+            progress_bar.progress(min(loaded / total_count, 1.0), text=f"{progress_text} ({loaded}/{total_count})")
+    
+    # The estimate can run low, so keep reading until a short batch marks the end of the table
+    next_offset = offsets[-1] + page_size if offsets else page_size
+    while last_batch_size == page_size:
+        batch = fetch_batch(next_offset)
+        if batch:
+            frames.append(rows_to_dataframe(batch))
+        last_batch_size = len(batch)
+        next_offset += page_size
     
     # Clear progress bar when done
     progress_bar.empty()
     
-    return pd.DataFrame(all_data)
+    # Batches whose inferred dtypes differ (e.g. an all-null column) concat to object, so pin again
+    df = frames[0] if len(frames) == 1 else pin_pump_dtypes(pd.concat(frames, ignore_index=True))
+    # Derive Model Group and clean Category once per load; the cached frame already carries them
+    df = prepare_pump_data(df)
+    # Remember when this snapshot was read so the footer shows the data time, not the render time
+    df.attrs["loaded_at"] = datetime.now(taiwan_tz)
+    return df
+
+def fetch_pump_by_id(db_id):
+    """
+    Fetch a single pump record by DB ID; returns None if it no longer exists.
+    Not cached, so the Edit/Delete forms always show the row's current values
+    """
+    response = pump_table().select(PUMP_SELECT).eq('"DB ID"', db_id).limit(1).execute()
+    return response.data[0] if response.data else None
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def pump_model_options(_filtered_df, loaded_at, selected_group, selected_category):
+    """
+    Model No. labels keyed by DB ID for the Edit/Delete selectboxes, cached per
+    data load (loaded_at) and filter so reruns do not rebuild the list from the dataframe
+    """
+    return dict(zip(_filtered_df["DB ID"].tolist(), _filtered_df["Model No."].fillna("").tolist()))
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def pump_filter_values(_df, loaded_at):
+    """
+    Sorted distinct Model Groups and non-empty Categories of the loaded data,
+    computed once per load (keyed by its loaded_at time) instead of on every rerun
+    """
+    model_groups = sorted(_df["Model Group"].unique().tolist()) if "Model Group" in _df.columns else []
+    categories = []
+    if "Category" in _df.columns:
+        categories = sorted(c for c in _df["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"])
+    return model_groups, categories
+
+def rows_to_dataframe(rows):
+    """Build a DataFrame from Supabase rows through Arrow so columns get compact Arrow-backed dtypes"""
+    if not rows:
+        return pd.DataFrame()
+    try:
+        df = pa.Table.from_pylist(rows).to_pandas(types_mapper=pd.ArrowDtype)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Fall back to plain object columns if a column holds mixed types
+        df = pd.DataFrame(rows)
+    return pin_pump_dtypes(df)
+
+def pin_pump_dtypes(df):
+    """
+    Pin known columns to fixed-width dtypes (all-null or mixed columns would otherwise
+    stay null/object); a column whose values don't fit its dtype is left as it is
+    """
+    for column, dtype in PUMP_DTYPES.items():
+        if column in df.columns:
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+    return df
+
+def clear_pump_caches():
+    """Invalidate cached pump data after a write or a refresh"""
+    fetch_all_pump_data.clear()
+    pump_model_options.clear()
+    pump_filter_values.clear()
+    st.session_state.pop("sorted_view", None)
 
 # --- Apply filters to the dataframe (UPDATED) ---
 def apply_filters(df, selected_group, selected_category):
@@ -318,98 +469,186 @@ def apply_filters(df, selected_group, selected_category):
     Returns:
     - filtered_df: The filtered dataframe
     """
-    filtered_df = df.copy()
-    
     # Get the translated "All" option
     all_option = get_text("all_option")
     
+    # Combine the filters into one boolean mask and slice once, without copying the frame first
+    mask = None
+    
     # Apply Model Group filter - using translated "All" value
     if selected_group != all_option:
-        filtered_df = filtered_df[filtered_df['Model Group'] == selected_group]
+        mask = df['Model Group'] == selected_group
     
     # Apply Category filter if it exists - using translated "All" value
     if "Category" in df.columns and selected_category != all_option:
         # Use exact case-insensitive matching
-        filtered_df = filtered_df[filtered_df["Category"].str.lower() == selected_category.lower()]
+        category_mask = match_category(df["Category"], selected_category)
+        mask = category_mask if mask is None else mask & category_mask
     
-    return filtered_df
+    return df if mask is None else df[mask]
+
+def match_category(categories, category):
+    """
+    Case-insensitive equality mask for a Category column. Only the distinct
+    categories are lowercased; rows are then matched on their category codes
+    """
+    if not isinstance(categories.dtype, pd.CategoricalDtype):
+        return categories.str.lower() == category.lower()
+    names = categories.cat.categories
+    return categories.isin(names[names.str.lower() == category.lower()])
 
 # --- Model Categorization Function ---
 def extract_model_group(model):
-    if pd.isna(model):
+    # Cheap scalar NaN check (NaN != NaN) instead of pd.isna; pd.NA is not a string either
+    if model is None or model is pd.NA or (isinstance(model, float) and model != model):
         return "Other"
-    model = str(model).strip().upper()
-    match = re.search(r'\d+([A-Z]+)\d+', model)
+    model = model.strip().upper() if isinstance(model, str) else str(model).strip().upper()
+    match = MODEL_GROUP_INFIX_RE.search(model)
     if match:
         return match.group(1)
     if 'ADL' in model:
         return 'ADL'
-    match = re.match(r'([A-Z]+)', model)
+    match = MODEL_GROUP_PREFIX_RE.match(model)
     return match.group(1) if match else 'Other'
 
+def extract_model_groups(models):
+    """Vectorized extract_model_group over a whole Model No. column"""
+    models = models.astype("string[pyarrow]").str.strip().str.upper()
+    groups = models.str.extract(MODEL_GROUP_INFIX_RE, expand=False)
+    prefixes = models.str.extract(MODEL_GROUP_PREFIX_RE, expand=False)
+    prefixes = prefixes.mask(models.str.contains("ADL", regex=False, na=False), "ADL")
+    return groups.fillna(prefixes).fillna("Other")
+
+def prepare_pump_data(df):
+    """Add the Model Group column and normalize Category values of fetched pump data"""
+    if df.empty:
+        return df
+    
+    # Add Model Group for categorization if Model No. exists
+    if 'Model No.' in df.columns:
+        df['Model Group'] = extract_model_groups(df['Model No.'])
+    
+    # Clean up Category values to ensure consistent filtering
+    if "Category" in df.columns:
+        # Convert all category values to Arrow-backed strings and strip whitespace
+        df["Category"] = df["Category"].astype("string[pyarrow]").fillna("").str.strip()
+        # Replace NaN, None, etc. with empty string for consistent handling
+        df["Category"] = df["Category"].replace(["nan", "None", "NaN", "<NA>"], "")
+        # Few distinct values repeat across many rows, so store them as a categorical
+        df["Category"] = df["Category"].astype("category")
+    
+    return df
+
+# --- Record Cleaning Functions ---
+def to_int(value):
+    """Convert a value to int, truncating any decimal part ("50.0" -> 50); None if not numeric"""
+    try:
+        return int(float(value))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+def to_float(value):
+    """Convert a value to float; None if not numeric"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+FIELD_COERCERS = {**dict.fromkeys(INT_FIELDS, to_int), **dict.fromkeys(FLOAT_FIELDS, to_float)}
+
+def clean_pump_record(pump_data, invalid_fields=None):
+    """
+    Coerce a pump record to the types expected by the database
+    
+    Empty and missing values become None, numeric fields are converted with
+    FIELD_COERCERS and everything else is stored as a string. Numeric fields
+    whose value could not be converted are appended to invalid_fields, if given.
+    """
+    clean_data = {}
+    for key, value in pump_data.items():
+        if pd.isna(value) or value == "":
+            clean_data[key] = None
+            continue
+        clean_data[key] = FIELD_COERCERS.get(key, str)(value)
+        if clean_data[key] is None and invalid_fields is not None:
+            invalid_fields.append(key)
+    return clean_data
+
+def clean_pump_frame(pump_df, invalid_fields=None):
+    """
+    Vectorized clean_pump_record for many rows at once (e.g. an imported CSV).
+    Unknown columns and DB ID are dropped; returns a list of JSON-ready dicts.
+    Numeric fields that could not be converted are collected per row index in
+    invalid_fields, if a dict is given
+    """
+    columns = {}
+    for column in pump_df.columns:
+        if column not in PUMP_COLUMNS or column == "DB ID":
+            continue
+        raw = values = pump_df[column]
+        if column in INT_FIELDS:
+            # Truncate like int(float(value)); non-numeric values become missing, and so
+            # do inf and values outside the int64 range, which no integer column can hold
+            numbers = pd.to_numeric(values, errors="coerce").astype("Float64")
+            numbers = numbers.where(np.isfinite(numbers) & (numbers.abs() < 2**63))
+            values = np.trunc(numbers).astype("Int64")
+        elif column in FLOAT_FIELDS:
+            values = pd.to_numeric(values, errors="coerce").astype("Float64")
+        else:
+            values = values.astype("string").mask(values == "")
+        
+        if invalid_fields is not None and column in FIELD_COERCERS:
+            # Cells that held a value but came out missing could not be converted
+            failed = values.isna() & raw.notna() & (raw.astype("string").fillna("") != "")
+            for index in failed[failed].index:
+                invalid_fields.setdefault(index, []).append(column)
+        columns[column] = values
+    
+    cleaned = pd.DataFrame(columns, index=pump_df.index).astype(object)
+    return cleaned.where(cleaned.notna(), None).to_dict("records")
+
 def insert_pump_data(pump_data, description=None):
     try:
-        # Create a copy of the data for safe modification
-        clean_data = {}
+        # Clean the data into a new dict that is safe to modify
+        invalid_fields = []
+        clean_data = clean_pump_record(pump_data, invalid_fields)
         
-        # First, get the maximum DB ID to generate a new one
-        try:
-            # Use double quotes around column name with space
-            max_id_response = supabase.table("pump_selection_data").select('"DB ID"').order('"DB ID"', desc=True).limit(1).execute()
-            if max_id_response.data:
-                max_id = max_id_response.data[0]["DB ID"]
-                new_id = max_id + 1
-            else:
-                new_id = 1  # Start from 1 if no records exist
-            
-            # Add the new ID to the data
-            clean_data["DB ID"] = new_id
-        except Exception as id_error:
-            st.error(f"Error generating DB ID: {id_error}")
-            st.error(traceback.format_exc())
-            return False, get_text("could_not_generate_db_id")
+        # Reject values that are not numbers instead of storing them as NULL
+        if invalid_fields:
+            return False, get_text("invalid_numeric_fields", ", ".join(invalid_fields))
         
-        # Convert and clean each field individually
-        for key, value in pump_data.items():
-            # Skip empty values for optional fields
-            if value == "" or pd.isna(value):
-                clean_data[key] = None
-                continue
+        # DB IDs come from a max lookup, so a concurrent insert can take the same ID;
+        # on a duplicate-key error read the max again and retry
+        for attempt in range(INSERT_ID_ATTEMPTS):
+            # First, get the maximum DB ID to generate a new one
+            try:
+                # Use double quotes around column name with space
+                max_id_response = pump_table().select('"DB ID"').order('"DB ID"', desc=True).limit(1).execute()
+                if max_id_response.data:
+                    max_id = max_id_response.data[0]["DB ID"]
+                    new_id = max_id + 1
+                else:
+                    new_id = 1  # Start from 1 if no records exist
                 
-            # Fields that should be integers in the database
-            if key in ["Frequency_Hz", "Phase", "Outlet (mm)", "Pass Solid Dia(mm)"]:
-                try:
-                    # Force integer conversion (truncate decimal)
-                    if isinstance(value, float):
-                        value = int(value)
-                    elif isinstance(value, str):
-                        # Remove any decimal part
-                        value = int(float(value))
-                    clean_data[key] = value
-                except ValueError:
-                    st.error(f"Cannot convert '{key}: {value}' to integer. Skipping this field.")
-                    # Skip this field to avoid errors
-                    continue
+                # Add the new ID to the data
+                clean_data["DB ID"] = new_id
+            except Exception as id_error:
+                st.error(f"Error generating DB ID: {id_error}")
+                logger.exception("Error generating DB ID")
+                return False, get_text("could_not_generate_db_id")
             
-            # For fields that are floats
-            elif key in ["Max Head (M)"]:
-                try:
-                    clean_data[key] = float(value)
-                except ValueError:
-                    st.error(f"Cannot convert '{key}: {value}' to float. Skipping this field.")
-                    # Skip this field to avoid errors
-                    continue
-                    
-            # Everything else is treated as string
-            else:
-                clean_data[key] = str(value)
-        
-        # Insert the data
-        response = supabase.table("pump_selection_data").insert(clean_data).execute()
+            # Insert the data
+            try:
+                response = pump_table().insert(clean_data).execute()
+                break
+            except APIError as insert_error:
+                if insert_error.code != UNIQUE_VIOLATION or attempt == INSERT_ID_ATTEMPTS - 1:
+                    raise
+                logger.warning("DB ID %s was taken by a concurrent insert, retrying", new_id)
         
         # Log the change in the audit trail
         log_database_change(
-            table_name="pump_selection_data",
+            table_name=PUMP_TABLE,
             record_id=new_id,
             operation="INSERT",
             new_data=clean_data,
@@ -418,96 +657,145 @@ def insert_pump_data(pump_data, description=None):
         
         return True, get_text("pump_data_added", new_id)
     except Exception as e:
-        st.error(f"Error details for debugging: {str(e)}")
-        st.error(traceback.format_exc())
+        if DEBUG:
+            st.error(f"Error details for debugging: {str(e)}")
+        logger.exception("Error adding pump data")
         return False, get_text("error_adding_pump", e)
 
+def next_pump_id():
+    """DB ID following the current maximum, or 1 for an empty table"""
+    max_id_response = pump_table().select('"DB ID"').order('"DB ID"', desc=True).limit(1).execute()
+    return max_id_response.data[0]["DB ID"] + 1 if max_id_response.data else 1
+
+def insert_pump_data_bulk(pump_df, description=None):
+    """
+    Insert many pump records with one request per chunk
+    
+    Parameters:
+    - pump_df: DataFrame of pump rows (e.g. a CSV); unknown columns and any DB ID are ignored
+    - description: Optional description of the import
+    
+    Returns:
+    - success: Boolean indicating if any records were inserted
+    - message: Status message
+    - success_count: Number of inserted records
+    - error_count: Number of rows that failed or were skipped
+    """
+    success_count = 0
+    error_count = 0
+    error_messages = []
+    
+    # Clean every row up front; rows without a Model No. or with non-numeric values
+    # in numeric fields are skipped and reported by their CSV line (the header is line 1)
+    records = []
+    invalid_fields = {}
+    for index, record in zip(pump_df.index, clean_pump_frame(pump_df, invalid_fields)):
+        if not (record.get("Model No.") or "").strip():
+            error_count += 1
+            error_messages.append(f"Row {index + 2}: {get_text('model_no_required')}")
+            continue
+        if index in invalid_fields:
+            error_count += 1
+            error_messages.append(f"Row {index + 2}: {get_text('invalid_numeric_fields', ', '.join(invalid_fields[index]))}")
+            continue
+        records.append(record)
+    
+    if records:
+        try:
+            # Reserve a block of DB IDs with a single max lookup
+            next_id = next_pump_id()
+        except Exception as e:
+            st.error(f"Error generating DB ID: {e}")
+            logger.exception("Error generating DB IDs")
+            return False, get_text("could_not_generate_db_id"), 0, error_count + len(records)
+        
+        progress_text = get_text("importing_records")
+        progress_bar = st.progress(0, text=progress_text)
+        
+        for start_idx in range(0, len(records), BULK_CHUNK_SIZE):
+            chunk = records[start_idx:start_idx + BULK_CHUNK_SIZE]
+            try:
+                for attempt in range(INSERT_ID_ATTEMPTS):
+                    # PostgREST bulk inserts need the same keys in every object
+                    for record in chunk:
+                        record["DB ID"] = next_id
+                        next_id += 1
+                    try:
+                        response = pump_table().insert(chunk).execute()
+                        break
+                    except APIError as insert_error:
+                        if insert_error.code != UNIQUE_VIOLATION or attempt == INSERT_ID_ATTEMPTS - 1:
+                            raise
+                        # A concurrent insert took IDs from the block; continue after the new maximum
+                        logger.warning("DB IDs %s-%s were taken by a concurrent insert, retrying", chunk[0]["DB ID"], chunk[-1]["DB ID"])
+                        next_id = next_pump_id()
+                success_count += len(chunk)
+                
+                # Log in audit trail
+                try:
+                    audit_records = [
+                        build_audit_record(
+                            table_name=PUMP_TABLE,
+                            record_id=record["DB ID"],
+                            operation="INSERT",
+                            new_data=record,
+                            description=description or f"Imported pump: {record.get('Model No.', 'Unknown')}"
+                        )
+                        for record in chunk
+                    ]
+                    audit_table().insert(audit_records).execute()
+                except Exception as e:
+                    st.error(f"Failed to create audit trail entry: {e}")
+                    logger.exception("Failed to create audit trail entries")
+            except Exception as e:
+                error_count += len(chunk)
+                error_messages.append(f"Error importing DB IDs {chunk[0]['DB ID']}-{chunk[-1]['DB ID']}: {str(e)}")
+            
+            # Update progress
+            done = min(start_idx + BULK_CHUNK_SIZE, len(records))
+            progress_bar.progress(done / len(records), text=f"{progress_text} ({done}/{len(records)})")
+        
+        progress_bar.empty()
+    
+    # Create result message
+    if error_count == 0:
+        return True, get_text("imported_all_successfully", success_count), success_count, error_count
+    else:
+        error_details = "\n".join(error_messages[:5])
+        if len(error_messages) > 5:
+            error_details += f"\n... and {len(error_messages) - 5} more errors."
+        
+        message = get_text("imported_with_errors", success_count, error_count) + f"\n{error_details}"
+        return success_count > 0, message, success_count, error_count
+
 # Modified update function
 def update_pump_data(db_id, pump_data, description=None):
     try:
         # First, fetch the current state of the record
-        current_record_response = supabase.table("pump_selection_data").select("*").eq('"DB ID"', db_id).execute()
+        current_record_response = pump_table().select("*").eq('"DB ID"', db_id).execute()
         
         if not current_record_response.data:
             return False, f"Record with DB ID {db_id} not found."
             
         old_data = current_record_response.data[0]
         
-        # Create a copy of the data for safe modification
-        clean_data = {}
+        # Clean the data, skipping DB ID since we don't want to update that
+        invalid_fields = []
+        clean_data = clean_pump_record({key: value for key, value in pump_data.items() if key != "DB ID"}, invalid_fields)
         
-        # Convert and clean each field individually
-        for key, value in pump_data.items():
-            # Skip DB ID since we don't want to update that
-            if key == "DB ID":
-                continue
-                
-            # Handle empty values
-            if value == "" or pd.isna(value):
-                clean_data[key] = None
-            # Try to intelligently convert values based on potential types
-            else:
-                # Fields that should be integers in the database (based on error)
-                if key in ["Frequency_Hz", "Phase", "Outlet (mm)", "Pass Solid Dia(mm)"]:
-                    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit()):
-                        try:
-                            # Force integer conversion (truncate decimal)
-                            if isinstance(value, float):
-                                value = int(value)
-                            elif isinstance(value, str):
-                                # Remove any decimal part
-                                value = int(float(value))
-                            clean_data[key] = value
-                        except ValueError:
-                            st.error(f"Cannot convert '{key}: {value}' to integer. Skipping this field.")
-                            # Skip this field to avoid errors
-                            continue
-                    else:
-                        clean_data[key] = None
-                
-                # For fields that are floats
-                elif key in ["Max Head (M)"]:
-                    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit()):
-                        try:
-                            clean_data[key] = float(value)
-                        except ValueError:
-                            st.error(f"Cannot convert '{key}: {value}' to float. Skipping this field.")
-                            # Skip this field to avoid errors
-                            continue
-                    else:
-                        clean_data[key] = None
-                        
-                # Everything else is treated as string
-                else:
-                    clean_data[key] = str(value)
-        
-        # Remove any problematic fields
-        problem_keys = []
-        for key, value in list(clean_data.items()):
-            single_field = {key: value}
-            
-            try:
-                # Simulate update with just this field
-                test_response = supabase.table("pump_selection_data").update(single_field).eq('"DB ID"', db_id).execute()
-            except Exception as field_error:
-                st.error(f"Field '{key}' failed: {str(field_error)}")
-                problem_keys.append(key)
-        
-        # Remove any problematic fields
-        for key in problem_keys:
-            if key in clean_data:
-                st.warning(f"Removing problematic field '{key}' from update.")
-                del clean_data[key]
+        # Reject values that are not numbers instead of storing them as NULL
+        if invalid_fields:
+            return False, get_text("invalid_numeric_fields", ", ".join(invalid_fields))
         
         if not clean_data:
             return False, "No valid fields to update after cleaning data."
         
-        # Update with the cleaned data - note the double quotes around DB ID
-        response = supabase.table("pump_selection_data").update(clean_data).eq('"DB ID"', db_id).execute()
+        # Update all cleaned fields in a single request - note the double quotes around DB ID
+        response = pump_table().update(clean_data).eq('"DB ID"', db_id).execute()
         
         # Log the change in the audit trail
         log_database_change(
-            table_name="pump_selection_data",
+            table_name=PUMP_TABLE,
             record_id=db_id,
             operation="UPDATE",
             old_data=old_data,
@@ -517,15 +805,116 @@ def update_pump_data(db_id, pump_data, description=None):
         
         return True, get_text("pump_data_updated")
     except Exception as e:
-        st.error(f"Error details for debugging: {str(e)}")
-        st.error(traceback.format_exc())
+        if DEBUG:
+            st.error(f"Error details for debugging: {str(e)}")
+        logger.exception("Error updating pump data")
         return False, get_text("error_updating_pump", e)
 
+def update_pumps_bulk(edited_df, original_df, description=None):
+    """
+    Save the rows changed in a bulk edit with one upsert request per chunk
+    
+    Parameters:
+    - edited_df: Pump rows as returned by the data editor, including DB ID
+    - original_df: The same rows before editing, with the same index and columns
+    - description: Optional description of the bulk edit
+    
+    Returns:
+    - success: Boolean indicating if any records were updated
+    - message: Status message
+    - success_count: Number of updated records
+    - error_count: Number of records that failed to update
+    """
+    success_count = 0
+    error_count = 0
+    error_messages = []
+    
+    # Compare as plain Python values; a cell counts as changed unless both sides
+    # are equal or both are missing
+    before = original_df.astype(object).where(original_df.notna(), None)
+    after = edited_df.astype(object).where(edited_df.notna(), None)
+    changed_cells = ~((before == after) | (before.isna() & after.isna()))
+    changed = changed_cells.any(axis=1)
+    if not changed.any():
+        return False, get_text("no_changes_to_save"), 0, 0
+    
+    # Keep only the edited cells of each row, so columns nobody touched are taken from
+    # the live row rather than the cached copy; clean_pump_frame drops DB ID, so put it back
+    db_ids = before.loc[changed, "DB ID"].tolist()
+    records = [
+        {"DB ID": db_id, **{key: value for key, value in record.items() if cells[key]}}
+        for db_id, record, cells in zip(db_ids, clean_pump_frame(edited_df[changed]), changed_cells[changed].to_dict("records"))
+    ]
+    
+    progress_text = get_text("updating_records")
+    progress_bar = st.progress(0, text=progress_text)
+    
+    for start_idx in range(0, len(records), BULK_CHUNK_SIZE):
+        chunk = records[start_idx:start_idx + BULK_CHUNK_SIZE]
+        missing_count = 0
+        try:
+            # Read the live rows first: they are the audit's old data, and rows deleted
+            # since the data was loaded must not be re-created by the upsert
+            current_records_response = pump_table().select("*").in_('"DB ID"', [record["DB ID"] for record in chunk]).execute()
+            old_records = {row["DB ID"]: row for row in current_records_response.data}
+            
+            for record in chunk:
+                if record["DB ID"] not in old_records:
+                    missing_count += 1
+                    error_count += 1
+                    error_messages.append(f"Record with DB ID {record['DB ID']} not found.")
+            # Overlay the edited cells on the live rows; every record then has the same
+            # columns, so one upsert updates the whole chunk
+            chunk = [{**old_records[record["DB ID"]], **record} for record in chunk if record["DB ID"] in old_records]
+            if not chunk:
+                continue
+            
+            response = pump_table().upsert(chunk, on_conflict='"DB ID"').execute()
+            success_count += len(chunk)
+            
+            # Log in audit trail
+            try:
+                audit_records = [
+                    build_audit_record(
+                        table_name=PUMP_TABLE,
+                        record_id=record["DB ID"],
+                        operation="UPDATE",
+                        old_data=old_records[record["DB ID"]],
+                        new_data=record,
+                        description=description or f"Bulk updated pump: {old_records[record['DB ID']].get('Model No.', 'Unknown')}"
+                    )
+                    for record in chunk
+                ]
+                audit_table().insert(audit_records).execute()
+            except Exception as e:
+                st.error(f"Failed to create audit trail entry: {e}")
+                logger.exception("Failed to create audit trail entries")
+        except Exception as e:
+            error_count += len(chunk) - missing_count
+            error_messages.append(f"Error updating DB IDs {chunk[0]['DB ID']}-{chunk[-1]['DB ID']}: {str(e)}")
+        finally:
+            # Update progress
+            done = min(start_idx + BULK_CHUNK_SIZE, len(records))
+            progress_bar.progress(done / len(records), text=f"{progress_text} ({done}/{len(records)})")
+    
+    progress_bar.empty()
+    
+    # Create result message
+    if error_count == 0:
+        return True, get_text("updated_all_successfully", success_count), success_count, error_count
+    else:
+        error_details = "\n".join(error_messages[:5])
+        if len(error_messages) > 5:
+            error_details += f"\n... and {len(error_messages) - 5} more errors."
+        
+        message = get_text("updated_with_errors", success_count, error_count) + f"\n{error_details}"
+        return success_count > 0, message, success_count, error_count
+
 # Modified delete function
 def delete_pump_data(db_id, description=None):
     try:
         # First, fetch the current state of the record to save in history
-        current_record_response = supabase.table("pump_selection_data").select("*").eq('"DB ID"', db_id).execute()
+        current_record_response = pump_table().select("*").eq('"DB ID"', db_id).execute()
         
         if not current_record_response.data:
             return False, f"Record with DB ID {db_id} not found."
@@ -533,11 +922,11 @@ def delete_pump_data(db_id, description=None):
         old_data = current_record_response.data[0]
         
         # Note the double quotes around DB ID
-        response = supabase.table("pump_selection_data").delete().eq('"DB ID"', db_id).execute()
+        response = pump_table().delete().eq('"DB ID"', db_id).execute()
         
         # Log the deletion in the audit trail
         log_database_change(
-            table_name="pump_selection_data",
+            table_name=PUMP_TABLE,
             record_id=db_id,
             operation="DELETE",
             old_data=old_data,
@@ -546,8 +935,9 @@ def delete_pump_data(db_id, description=None):
         
         return True, get_text("pump_data_deleted")
     except Exception as e:
-        st.error(f"Error details for debugging: {str(e)}")
-        st.error(traceback.format_exc())
+        if DEBUG:
+            st.error(f"Error details for debugging: {str(e)}")
+        logger.exception("Error deleting pump data")
         return False, get_text("error_deleting_pump", e)
 
 # New function for bulk delete
@@ -573,41 +963,50 @@ def bulk_delete_pumps(db_ids, description=None):
     progress_text = get_text("deleting_records")
     progress_bar = st.progress(0, text=progress_text)
     
-    # Process each ID
-    for idx, db_id in enumerate(db_ids):
+    # Process the IDs in chunks: one select, one delete and one audit insert per chunk
+    for start_idx in range(0, len(db_ids), BULK_CHUNK_SIZE):
+        chunk = list(db_ids[start_idx:start_idx + BULK_CHUNK_SIZE])
+        missing_count = 0
         try:
-            # Fetch the current record for audit trail
-            current_record_response = supabase.table("pump_selection_data").select("*").eq('"DB ID"', db_id).execute()
-            
-            if not current_record_response.data:
-                error_count += 1
-                error_messages.append(f"Record with DB ID {db_id} not found.")
-                continue
-                
-            old_data = current_record_response.data[0]
-            model_no = old_data.get('Model No.', 'Unknown')
-            
-            # Delete the record
-            response = supabase.table("pump_selection_data").delete().eq('"DB ID"', db_id).execute()
-            
-            # Log in audit trail
-            log_database_change(
-                table_name="pump_selection_data",
-                record_id=db_id,
-                operation="DELETE",
-                old_data=old_data,
-                description=description or f"Bulk deleted pump: {model_no}"
-            )
+            # Fetch the current records for audit trail
+            current_records_response = pump_table().select("*").in_('"DB ID"', chunk).execute()
+            old_records = {row["DB ID"]: row for row in current_records_response.data}
             
-            success_count += 1
+            for db_id in chunk:
+                if db_id not in old_records:
+                    missing_count += 1
+                    error_count += 1
+                    error_messages.append(f"Record with DB ID {db_id} not found.")
             
-            # Update progress
-            progress = (idx + 1) / len(db_ids)
-            progress_bar.progress(progress, text=f"{progress_text} ({idx+1}/{len(db_ids)})")
+            if old_records:
+                # Delete the records
+                response = pump_table().delete().in_('"DB ID"', list(old_records)).execute()
+                success_count += len(old_records)
+                
+                # Log in audit trail
+                try:
+                    audit_records = [
+                        build_audit_record(
+                            table_name=PUMP_TABLE,
+                            record_id=db_id,
+                            operation="DELETE",
+                            old_data=old_data,
+                            description=description or f"Bulk deleted pump: {old_data.get('Model No.', 'Unknown')}"
+                        )
+                        for db_id, old_data in old_records.items()
+                    ]
+                    audit_table().insert(audit_records).execute()
+                except Exception as e:
+                    st.error(f"Failed to create audit trail entry: {e}")
+                    logger.exception("Failed to create audit trail entries")
             
         except Exception as e:
-            error_count += 1
-            error_messages.append(f"Error deleting DB ID {db_id}: {str(e)}")
+            error_count += len(chunk) - missing_count
+            error_messages.append(f"Error deleting DB IDs {chunk[0]}-{chunk[-1]}: {str(e)}")
+        
+        # Update progress
+        done = min(start_idx + BULK_CHUNK_SIZE, len(db_ids))
+        progress_bar.progress(done / len(db_ids), text=f"{progress_text} ({done}/{len(db_ids)})")
     
     # Clear progress bar
     progress_bar.empty()
@@ -629,7 +1028,8 @@ st.markdown(get_text('app_description'))
 st.info(f"{get_text('current_time')}: {datetime.now(taiwan_tz).strftime('%Y-%m-%d %H:%M:%S')}")
 
 # --- Initialize Supabase Client ---
-supabase = init_connection()
+# Resolve the shared client up front so missing secrets stop the page before any query
+init_connection()
 
 # --- Fetch Data ---
 try:
@@ -639,21 +1039,9 @@ try:
     
     # Fetch all data initially
     df = fetch_all_pump_data()
-    
-    if not df.empty:
-        # Add Model Group for categorization if Model No. exists
-        if 'Model No.' in df.columns:
-            df['Model Group'] = df['Model No.'].apply(extract_model_group)
-        
-        # Clean up Category values to ensure consistent filtering
-        if "Category" in df.columns:
-            # Convert all category values to strings and strip whitespace
-            df["Category"] = df["Category"].astype(str).str.strip()
-            # Replace NaN, None, etc. with empty string for consistent handling
-            df["Category"] = df["Category"].replace(["nan", "None", "NaN"], "")
 except Exception as e:
     st.error(f"Error fetching data: {e}")
-    st.error(traceback.format_exc())
+    logger.exception("Error fetching pump data")
     df = pd.DataFrame()
     table_columns = []
 
@@ -668,19 +1056,21 @@ with st.sidebar:
     if not df.empty:
         st.header(get_text("filters"))
         
+        # Distinct filter values are computed once per load
+        model_group_values, category_values = pump_filter_values(df, df.attrs.get("loaded_at"))
+        
         # Model Group Filter (if we have Model Group column)
         all_option = get_text("all_option")
         if 'Model Group' in df.columns:
-            model_groups = [all_option] + sorted(df['Model Group'].unique().tolist())
+            model_groups = [all_option] + model_group_values
             selected_group = st.selectbox(get_text("filter_by_model_group"), model_groups)
         else:
             selected_group = all_option
         
         # Category Filter (if exists)
         if "Category" in df.columns:
-            # Get unique non-empty categories
-            categories = [c for c in df["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"]]
-            categories = [all_option] + sorted(categories)
+            # Unique non-empty categories
+            categories = [all_option] + category_values
             selected_category = st.selectbox(get_text("filter_by_category"), categories)
         else:
             selected_category = all_option
@@ -689,101 +1079,105 @@ with st.sidebar:
         selected_group = all_option
         selected_category = all_option
     
-    if st.button(f"🔄 {get_text('refresh_data')}"):
-        st.cache_data.clear()
-        st.rerun()
+    # Clear in the click callback, which runs before the rerun reloads the data
+    st.button(f"🔄 {get_text('refresh_data')}", on_click=clear_pump_caches)
 
-# --- Main Content Based on Action ---
-if action == get_text("view_data"):
-    # Initialize realtime updates
-    if 'realtime_initialized' not in st.session_state:
-        st.session_state.realtime_initialized = True
-        fetch_changes, show_changes = setup_realtime_updates()
+def sorted_view(filtered_df, sort_key, sort_column, ascending):
+    """
+    Sort the filtered View frame, reusing the last result while sort_key (data load,
+    filters, search and sort) is unchanged so paging does not re-sort every page
+    """
+    cached = st.session_state.get("sorted_view")
+    if cached and cached[0] == sort_key:
+        return cached[1]
+    sorted_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
+    st.session_state["sorted_view"] = (sort_key, sorted_df)
+    return sorted_df
 
-    # Auto-refresh logic for realtime updates
-    if st.session_state.get('auto_refresh', True):
-        # Check for changes periodically
-        refresh_placeholder = st.empty()
-        if 'fetch_changes' in st.session_state and 'show_changes' in st.session_state:
-            has_new = st.session_state.fetch_changes()
-            if has_new:
-                st.session_state.show_changes()
-            
-            # Update the refresh message with Taiwan time
-            refresh_placeholder.info(f"{get_text('last_checked')}: {datetime.now(taiwan_tz).strftime('%H:%M:%S')}")
+@st.fragment
+def view_data_fragment(df, selected_group, selected_category):
+    """
+    Render the View Data table as a fragment so search, sort and paging widgets
+    rerun only this section instead of the whole page
+    """
+    all_option = get_text("all_option")
     
     try:
-        if df.empty:
-            st.info(get_text("no_data_found"))
+        # Display data info
+        st.success(f"✅ {get_text('loaded_records', len(df))}")
+        
+        # Apply filters - using the updated function
+        filtered_df = apply_filters(df, selected_group, selected_category)
+        
+        # Show filter results
+        if selected_group != all_option:
+            st.write(f"{get_text('filter_by_model_group')}: {selected_group}")
+        if selected_category != all_option:
+            st.write(f"{get_text('filter_by_category')}: {selected_category} ({get_text('matching')} {len(filtered_df)} {get_text('records')})")
+        
+        # Add search functionality
+        search_term = st.text_input(f"🔍 {get_text('search_by_model')}")
+        
+        if search_term:
+            # Search the already loaded and filtered rows; the term is matched literally
+            filtered_df = filtered_df[filtered_df["Model No."].str.contains(search_term, case=False, regex=False, na=False)]
+            st.write(f"{get_text('found')} {len(filtered_df)} {get_text('matching_pumps')}")
+        
+        if filtered_df.empty:
+            st.info(get_text("no_match"))
         else:
-            # Display data info
-            st.success(f"✅ {get_text('loaded_records', len(df))}")
+            # Data Table with pagination controls
+            st.subheader(f"📋 {get_text('pump_data_table')}")
             
-            # Apply filters - using the updated function
-            filtered_df = apply_filters(df, selected_group, selected_category)
+            # Add sorting options
+            if 'Model Group' in filtered_df.columns:
+                sort_columns = ["Model Group", "DB ID"] + [col for col in filtered_df.columns if col not in ["DB ID", "Model Group"]]
+            else:
+                sort_columns = ["DB ID"] + [col for col in filtered_df.columns if col != "DB ID"]
             
-            # Show filter results
-            if selected_group != all_option:
-                st.write(f"{get_text('filter_by_model_group')}: {selected_group}")
-            if selected_category != all_option:
-                st.write(f"{get_text('filter_by_category')}: {selected_category} ({get_text('matching')} {len(filtered_df)} {get_text('records')})")
+            sort_column = st.selectbox(get_text("sort_by"), sort_columns, index=0)
+            sort_order = st.radio(get_text("sort_order"), [get_text("ascending"), get_text("descending")], horizontal=True)
             
-            # Add search functionality
-            search_term = st.text_input(f"🔍 {get_text('search_by_model')}")
+            ascending = sort_order == get_text("ascending")
             
-            if search_term:
-                filtered_df = filtered_df[filtered_df["Model No."].astype(str).str.contains(search_term, case=False, na=False)]
-                st.write(f"{get_text('found')} {len(filtered_df)} {get_text('matching_pumps')}")
+            # Identifies the sorted client-side view, so paging can reuse it
+            sort_key = (df.attrs.get("loaded_at"), selected_group, selected_category, search_term, sort_column, ascending)
             
-            if filtered_df.empty:
-                st.info(get_text("no_match"))
+            # Show row count selection
+            rows_per_page = st.selectbox(get_text("rows_per_page"), [10, 25, 50, 100, get_text("all_option")], index=1)
+            
+            if rows_per_page == get_text("all_option"):
+                st.dataframe(sorted_view(filtered_df, sort_key, sort_column, ascending), use_container_width=True)
             else:
-                # Data Table with pagination controls
-                st.subheader(f"📋 {get_text('pump_data_table')}")
-                
-                # Add sorting options
-                sort_columns = ["Model Group", "DB ID"] + [col for col in filtered_df.columns if col not in ["DB ID", "Model Group"]]
-                sort_column = st.selectbox(get_text("sort_by"), sort_columns, index=0)
-                sort_order = st.radio(get_text("sort_order"), [get_text("ascending"), get_text("descending")], horizontal=True)
+                # Convert to integer if not "all_option"
+                rows_per_page = int(rows_per_page)
                 
-                # Apply sorting
-                if sort_order == get_text("ascending"):
-                    sorted_df = filtered_df.sort_values(by=sort_column)
-                else:
-                    sorted_df = filtered_df.sort_values(by=sort_column, ascending=False)
-                
-                # Show row count selection
-                rows_per_page = st.selectbox(get_text("rows_per_page"), [10, 25, 50, 100, get_text("all_option")], index=1)
+                # Manual pagination
+                total_rows = len(filtered_df)
+                total_pages = (total_rows + rows_per_page - 1) // rows_per_page
                 
-                if rows_per_page == get_text("all_option"):
-                    st.dataframe(sorted_df, use_container_width=True)
-                else:
-                    # Convert to integer if not "all_option"
-                    rows_per_page = int(rows_per_page)
+                if total_pages > 0:
+                    page = st.number_input(get_text("page"), min_value=1, max_value=total_pages, value=1)
+                    start_idx = (page - 1) * rows_per_page
+                    end_idx = min(start_idx + rows_per_page, total_rows)
                     
-                    # Manual pagination
-                    total_rows = len(sorted_df)
-                    total_pages = (total_rows + rows_per_page - 1) // rows_per_page
+                    page_df = sorted_view(filtered_df, sort_key, sort_column, ascending).iloc[start_idx:end_idx]
                     
-                    if total_pages > 0:
-                        page = st.number_input(get_text("page"), min_value=1, max_value=total_pages, value=1)
-                        start_idx = (page - 1) * rows_per_page
-                        end_idx = min(start_idx + rows_per_page, total_rows)
-                        
-                        st.dataframe(sorted_df.iloc[start_idx:end_idx], use_container_width=True)
-                        st.write(get_text("showing_rows", start_idx+1, end_idx, total_rows))
-                    else:
-                        st.info(get_text("no_data_to_display"))
-                
-                # Show summary by group
+                    st.dataframe(page_df, use_container_width=True)
+                    st.write(get_text("showing_rows", start_idx+1, end_idx, total_rows))
+                else:
+                    st.info(get_text("no_data_to_display"))
+            
+            # Show summary by group if Model Group exists
+            if 'Model Group' in filtered_df.columns:
                 st.subheader(f"📊 {get_text('model_group_summary')}")
                 group_counts = filtered_df['Model Group'].value_counts().reset_index()
                 group_counts.columns = [get_text('model_group'), get_text('count')]
                 st.dataframe(group_counts, use_container_width=True)
-                    
+                
     except Exception as e:
         st.error(f"Error: {e}")
-        st.error(traceback.format_exc())
+        logger.exception("Error rendering data view")
 
 def create_dynamic_form(columns, existing_data=None, form_key="default"):
     """
@@ -847,8 +1241,7 @@ def create_dynamic_form(columns, existing_data=None, form_key="default"):
             elif column == "Category":
                 # Category dropdown if we have existing categories
                 if not df.empty and "Category" in df.columns:
-                    categories = [c for c in df["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"]]
-                    categories = [""] + sorted(categories)
+                    categories = [""] + pump_filter_values(df, df.attrs.get("loaded_at"))[1]
                     default_index = categories.index(current_value) if current_value in categories else 0
                     form_data[column] = st.selectbox(column, categories, index=default_index, key=f"{form_key}_{column}")
                 else:
@@ -862,113 +1255,75 @@ def create_dynamic_form(columns, existing_data=None, form_key="default"):
     
     return form_data
 
-# --- Main Content Based on Action ---
-if action == get_text("view_data"):
-    # Initialize realtime updates
-    if 'realtime_initialized' not in st.session_state:
-        st.session_state.realtime_initialized = True
-        fetch_changes, show_changes = setup_realtime_updates()
-
-    # Auto-refresh logic for realtime updates
-    if st.session_state.get('auto_refresh', True):
-        # Check for changes periodically
-        refresh_placeholder = st.empty()
-        if 'fetch_changes' in st.session_state and 'show_changes' in st.session_state:
-            has_new = st.session_state.fetch_changes()
-            if has_new:
-                st.session_state.show_changes()
-            
-            # Update the refresh message with Taiwan time
-            refresh_placeholder.info(f"{get_text('last_checked')}: {datetime.now(taiwan_tz).strftime('%H:%M:%S')}")
+def render_edit_input(column, current_value, categories):
+    """
+    Render the Edit form widget for a column, pre-filled with its current value
     
-    try:
-        if df.empty:
-            st.info(get_text("no_data_found"))
-        else:
-            # Display data info
-            st.success(f"✅ {get_text('loaded_records', len(df))}")
-            
-            # Apply filters - using the updated function
-            filtered_df = apply_filters(df, selected_group, selected_category)
-            
-            # Show filter results
-            if selected_group != all_option:
-                st.write(f"{get_text('filter_by_model_group')}: {selected_group}")
-            if selected_category != all_option:
-                st.write(f"{get_text('filter_by_category')}: {selected_category} ({get_text('matching')} {len(filtered_df)} {get_text('records')})")
-            
-            # Add search functionality
-            search_term = st.text_input(f"🔍 {get_text('search_by_model')}")
-            
-            if search_term:
-                if "Model No." in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df["Model No."].astype(str).str.contains(search_term, case=False, na=False)]
-                st.write(f"{get_text('found')} {len(filtered_df)} {get_text('matching_pumps')}")
-            
-            if filtered_df.empty:
-                st.info(get_text("no_match"))
-            else:
-                # Data Table with pagination controls
-                st.subheader(f"📋 {get_text('pump_data_table')}")
-                
-                # Add sorting options
-                if 'Model Group' in filtered_df.columns:
-                    sort_columns = ["Model Group", "DB ID"] + [col for col in filtered_df.columns if col not in ["DB ID", "Model Group"]]
-                else:
-                    sort_columns = ["DB ID"] + [col for col in filtered_df.columns if col != "DB ID"]
-                
-                sort_column = st.selectbox(get_text("sort_by"), sort_columns, index=0)
-                sort_order = st.radio(get_text("sort_order"), [get_text("ascending"), get_text("descending")], horizontal=True)
-                
-                # Apply sorting
-                if sort_order == get_text("ascending"):
-                    sorted_df = filtered_df.sort_values(by=sort_column)
-                else:
-                    sorted_df = filtered_df.sort_values(by=sort_column, ascending=False)
-                
-                # Show row count selection
-                rows_per_page = st.selectbox(get_text("rows_per_page"), [10, 25, 50, 100, get_text("all_option")], index=1)
-                
-                if rows_per_page == get_text("all_option"):
-                    st.dataframe(sorted_df, use_container_width=True)
-                else:
-                    # Convert to integer if not "all_option"
-                    rows_per_page = int(rows_per_page)
-                    
-                    # Manual pagination
-                    total_rows = len(sorted_df)
-                    total_pages = (total_rows + rows_per_page - 1) // rows_per_page
-                    
-                    if total_pages > 0:
-                        page = st.number_input(get_text("page"), min_value=1, max_value=total_pages, value=1)
-                        start_idx = (page - 1) * rows_per_page
-                        end_idx = min(start_idx + rows_per_page, total_rows)
-                        
-                        st.dataframe(sorted_df.iloc[start_idx:end_idx], use_container_width=True)
-                        st.write(get_text("showing_rows", start_idx+1, end_idx, total_rows))
-                    else:
-                        st.info(get_text("no_data_to_display"))
-                
-                # Show summary by group if Model Group exists
-                if 'Model Group' in filtered_df.columns:
-                    st.subheader(f"📊 {get_text('model_group_summary')}")
-                    group_counts = filtered_df['Model Group'].value_counts().reset_index()
-                    group_counts.columns = [get_text('model_group'), get_text('count')]
-                    st.dataframe(group_counts, use_container_width=True)
-                    
-    except Exception as e:
-        st.error(f"Error: {e}")
-        st.error(traceback.format_exc())
-
-elif action == get_text("add_new_pump"):
-    st.subheader(get_text("add_new_pump"))
+    The widget kind comes from EDIT_WIDGET_KINDS; numeric values that cannot be
+    converted fall back to a text input so the stored value is never lost.
+    """
+    kind = EDIT_WIDGET_KINDS.get(column, "text")
     
-    # Get table columns
-    if 'table_columns' in st.session_state:
-        columns = st.session_state.table_columns
-    else:
-        columns = get_table_schema()
+    # Treat NaN/None and their string forms as empty
+    if current_value is None or pd.isna(current_value) or str(current_value).lower() in ["nan", "none", ""]:
+        current_value = None
+    
+    if kind == "int":
+        value = 0 if current_value is None else to_int(current_value)
+        if value is not None:
+            return st.number_input(column.replace("_", " "), value=value, step=1)
+    elif kind == "float":
+        value = 0.0 if current_value is None else to_float(current_value)
+        if value is not None:
+            return st.number_input(column, value=value)
+    elif kind == "category":
+        current_value = str(current_value).strip() if current_value is not None else ""
+        index = categories.index(current_value) if current_value in categories else 0
+        return st.selectbox(column, categories, index=index)
     
+    return st.text_input(column, value="" if current_value is None else str(current_value))
+
+@st.fragment
+def edit_pump_fragment(db_id, selected_pump, selected_pump_id, categories):
+    """
+    Render the Edit Pump form as a fragment so submitting it only reruns the form
+    instead of the whole page
+    """
+    with st.form("edit_pump_form"):
+        edited_data = {}
+        
+        # Create columns for better layout
+        for form_column, columns in zip(st.columns(2), EDIT_FORM_COLUMNS):
+            with form_column:
+                for column in columns:
+                    if column in selected_pump:
+                        edited_data[column] = render_edit_input(column, selected_pump[column], categories)
+        
+        # Add change description
+        change_description = st.text_area(get_text("change_description"), 
+                                        placeholder=get_text("edit_change_description_placeholder"))
+        
+        submit_button = st.form_submit_button(get_text("update_pump_button"))
+        
+        if submit_button:
+            success, message = update_pump_data(db_id, edited_data, description=change_description)
+            if success:
+                st.success(message)
+                # Show new Model Group if Model No. was changed
+                if edited_data.get("Model No.", selected_pump_id) != selected_pump_id:
+                    new_group = extract_model_group(edited_data["Model No."])
+                    st.info(get_text("new_model_group", new_group))
+                # Clear cache to refresh data
+                clear_pump_caches()
+            else:
+                st.error(message)
+
+@st.fragment
+def add_pump_fragment(columns):
+    """
+    Render the Add Pump form as a fragment so submitting it only reruns the form
+    instead of the whole page (data fetch, filters and sidebar included)
+    """
     # Create form for new pump
     with st.form("add_pump_form"):
         # Model No. is required
@@ -995,10 +1350,73 @@ elif action == get_text("add_new_pump"):
                 if success:
                     st.success(message)
                     # Clear cache to refresh data
-                    st.cache_data.clear()
+                    clear_pump_caches()
                 else:
                     st.error(message)
 
+# --- Main Content Based on Action ---
+if action == get_text("view_data"):
+    # Initialize realtime updates
+    if 'realtime_initialized' not in st.session_state:
+        st.session_state.realtime_initialized = True
+        fetch_changes, show_changes = setup_realtime_updates()
+
+    # Auto-refresh logic for realtime updates
+    if st.session_state.get('auto_refresh', True):
+        # Check for changes periodically
+        refresh_placeholder = st.empty()
+        if 'fetch_changes' in st.session_state and 'show_changes' in st.session_state:
+            has_new = st.session_state.fetch_changes()
+            if has_new:
+                st.session_state.show_changes()
+            
+            # Update the refresh message with Taiwan time
+            refresh_placeholder.info(f"{get_text('last_checked')}: {datetime.now(taiwan_tz).strftime('%H:%M:%S')}")
+    
+    if df.empty:
+        st.info(get_text("no_data_found"))
+    else:
+        view_data_fragment(df, selected_group, selected_category)
+
+elif action == get_text("add_new_pump"):
+    st.subheader(get_text("add_new_pump"))
+    
+    # Get table columns
+    if 'table_columns' in st.session_state:
+        columns = st.session_state.table_columns
+    else:
+        columns = get_table_schema()
+    
+    add_pump_fragment(columns)
+    
+    # Bulk import: one insert request per chunk of CSV rows
+    with st.expander(f"📥 {get_text('import_csv')}"):
+        uploaded_file = st.file_uploader(get_text("upload_csv"), type="csv")
+        if uploaded_file is not None:
+            try:
+                import_df = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+            except Exception as e:
+                st.error(get_text("error_reading_csv", e))
+                import_df = None
+            
+            if import_df is not None:
+                st.write(get_text("csv_rows_found", len(import_df)))
+                st.dataframe(import_df.head(10), use_container_width=True)
+                import_description = st.text_area(get_text("change_description"), placeholder=get_text("change_description_placeholder"), key="import_description")
+                
+                if st.button(get_text("import_csv_button")):
+                    try:
+                        success, message, success_count, error_count = insert_pump_data_bulk(import_df, description=import_description)
+                        if success:
+                            st.success(message)
+                            # Clear cache to refresh data
+                            clear_pump_caches()
+                        else:
+                            st.error(message)
+                    except Exception as e:
+                        st.error(f"Error importing pumps: {e}")
+                        logger.exception("Error importing pumps")
+
 elif action == get_text("edit_pump"):
     st.subheader(get_text("edit_pump"))
     st.caption(f"{get_text('current_time')}: {datetime.now(taiwan_tz).strftime('%Y-%m-%d %H:%M:%S')}")
@@ -1024,110 +1442,58 @@ elif action == get_text("edit_pump"):
                 id_column = "Model No."
                 
                 # Select pump to edit
-                pump_options = filtered_df[id_column].astype(str).tolist()
-                selected_pump_id = st.selectbox(get_text("select_pump_edit", id_column), pump_options)
+                pump_options = pump_model_options(filtered_df, df.attrs.get("loaded_at"), selected_group, selected_category)
+                db_id = st.selectbox(get_text("select_pump_edit", id_column), list(pump_options), format_func=pump_options.get)
+                selected_pump_id = pump_options[db_id]
                 
-                # Get selected pump data
-                selected_pump = filtered_df[filtered_df[id_column].astype(str) == selected_pump_id].iloc[0]
-                db_id = selected_pump["DB ID"]
+                # Get selected pump data by DB ID, re-reading the single row so the form shows its current values
+                selected_pump = fetch_pump_by_id(db_id)
+                if selected_pump is None:
+                    st.warning(get_text("pump_no_longer_exists", db_id))
+                    st.stop()
                 
                 # Show current Model Group
                 current_group = extract_model_group(selected_pump_id)
                 st.info(get_text("current_model_group", current_group))
                 
-                # Create form for editing
-                with st.form("edit_pump_form"):
-                    edited_data = {}
-                    
-                    # Create columns for better layout
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        for column in ["Model No.", "Frequency_Hz", "Phase", "HP", "Power(KW)", "Outlet (mm)", "Outlet (inch)"]:
-                            if column in df.columns:
-                                current_value = selected_pump[column]
-                                
-                                if pd.isna(current_value):
-                                    # Handle NaN values
-                                    if column in ["Frequency_Hz", "Phase", "Outlet (mm)"]:
-                                        edited_data[column] = st.number_input(f"{column.replace('_', ' ')}", value=0, step=1)
-                                    else:
-                                        edited_data[column] = st.text_input(f"{column}", value="")
-                                elif isinstance(current_value, (int, float)) and column in ["Frequency_Hz", "Phase", "Outlet (mm)"]:
-                                    edited_data[column] = st.number_input(f"{column.replace('_', ' ')}", value=int(current_value), step=1)
-                                elif isinstance(current_value, str) and column not in ["Frequency_Hz", "Phase", "Outlet (mm)"]:
-                                    edited_data[column] = st.text_input(f"{column}", value=current_value)
-                                else:
-                                    try:
-                                        if column in ["Frequency_Hz", "Phase", "Outlet (mm)"]:
-                                            edited_data[column] = st.number_input(f"{column.replace('_', ' ')}", value=int(float(current_value)), step=1)
-                                        else:
-                                            edited_data[column] = st.text_input(f"{column}", value=str(current_value))
-                                    except:
-                                        edited_data[column] = st.text_input(f"{column}", value=str(current_value))
-                    
-                    with col2:
-                        for column in ["Pass Solid Dia(mm)", "Max Flow (LPM)", "Max Head (M)", "Max Head (ft)", "Head Rated/M", "Q Rated/LPM", "Category", "Product Link"]:
-                            if column in df.columns:
-                                current_value = selected_pump[column]
-                                
-                                if pd.isna(current_value) or str(current_value).lower() in ["nan", "none", ""]:
-                                    # Handle NaN values
-                                    if column in ["Pass Solid Dia(mm)"]:
-                                        edited_data[column] = st.number_input(f"{column}", value=0, step=1)
-                                    elif column in ["Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
-                                        edited_data[column] = st.number_input(f"{column}", value=0.0)
-                                    elif column == "Category":
-                                        # Get unique non-empty categories
-                                        categories = [c for c in df["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"]]
-                                        categories = [""] + sorted(categories)
-                                        edited_data[column] = st.selectbox(f"{column}", categories)
-                                    else:
-                                        edited_data[column] = st.text_input(f"{column}", value="")
-                                elif column == "Category":
-                                    # Get unique non-empty categories
-                                    categories = [c for c in df["Category"].unique() if c and c.strip() and c.lower() not in ["nan", "none"]]
-                                    categories = [""] + sorted(categories)
-                                    edited_data[column] = st.selectbox(f"{column}", categories, index=categories.index(current_value) if current_value in categories else 0)
-                                elif isinstance(current_value, (int, float)) and column in ["Pass Solid Dia(mm)"]:
-                                    edited_data[column] = st.number_input(f"{column}", value=int(current_value), step=1)
-                                elif isinstance(current_value, (int, float)) and column in ["Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
-                                    edited_data[column] = st.number_input(f"{column}", value=float(current_value))
-                                elif isinstance(current_value, str) and column not in ["Pass Solid Dia(mm)", "Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
-                                    edited_data[column] = st.text_input(f"{column}", value=current_value)
-                                else:
-                                    try:
-                                        if column in ["Pass Solid Dia(mm)"]:
-                                            edited_data[column] = st.number_input(f"{column}", value=int(float(current_value)), step=1)
-                                        elif column in ["Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
-                                            edited_data[column] = st.number_input(f"{column}", value=float(current_value))
-                                        else:
-                                            edited_data[column] = st.text_input(f"{column}", value=str(current_value))
-                                    except:
-                                        edited_data[column] = st.text_input(f"{column}", value=str(current_value))
-                    
-                    # Add change description
-                    change_description = st.text_area(get_text("change_description"), 
-                                                    placeholder=get_text("edit_change_description_placeholder"))
-                    
-                    submit_button = st.form_submit_button(get_text("update_pump_button"))
+                # Categories offered in the Category dropdown
+                categories = [""] + pump_filter_values(df, df.attrs.get("loaded_at"))[1]
+                
+                edit_pump_fragment(db_id, selected_pump, selected_pump_id, categories)
+                
+                # Bulk edit: change many filtered rows in a grid and save them with one upsert per chunk.
+                # The grid holds the whole filtered table, so it is only built once opted in
+                if st.checkbox(f"📝 {get_text('bulk_edit')}", key="bulk_edit_open"):
+                    editor_columns = [column for column in PUMP_COLUMNS if column in filtered_df.columns]
+                    original_df = filtered_df[editor_columns]
+                    with st.form("bulk_edit_form"):
+                        edited_df = st.data_editor(
+                            original_df,
+                            key="bulk_editor",
+                            num_rows="fixed",
+                            disabled=["DB ID"],
+                            hide_index=True,
+                            use_container_width=True
+                        )
+                        bulk_edit_description = st.text_area(get_text("change_description"), placeholder=get_text("change_description_placeholder"), key="bulk_edit_description")
+                        save_bulk_edits = st.form_submit_button(get_text("save_bulk_edits"))
                     
-                    if submit_button:
-                        success, message = update_pump_data(db_id, edited_data, description=change_description)
+                    if save_bulk_edits:
+                        success, message, success_count, error_count = update_pumps_bulk(edited_df, original_df, description=bulk_edit_description)
                         if success:
                             st.success(message)
-                            # Show new Model Group if Model No. was changed
-                            if edited_data["Model No."] != selected_pump_id:
-                                new_group = extract_model_group(edited_data["Model No."])
-                                st.info(get_text("new_model_group", new_group))
-                            # Clear cache to refresh data
-                            st.cache_data.clear()
+                            # Clear cache to refresh data, and drop the grid's edits so they
+                            # are not applied again on top of the reloaded rows
+                            clear_pump_caches()
+                            st.session_state.pop("bulk_editor", None)
+                        elif success_count == 0 and error_count == 0:
+                            st.info(message)
                         else:
                             st.error(message)
     
     except Exception as e:
         st.error(f"Error setting up edit form: {e}")
-        st.error(traceback.format_exc())  # This will show the detailed error in development
+        logger.exception("Error setting up edit form")
 
 elif action == get_text("delete_pump"):
     st.subheader(get_text("delete_pump"))
@@ -1154,12 +1520,15 @@ elif action == get_text("delete_pump"):
                 id_column = "Model No."
                 
                 # Select pump to delete
-                pump_options = filtered_df[id_column].astype(str).tolist()
-                selected_pump_id = st.selectbox(get_text("select_pump_delete", id_column), pump_options)
+                pump_options = pump_model_options(filtered_df, df.attrs.get("loaded_at"), selected_group, selected_category)
+                db_id = st.selectbox(get_text("select_pump_delete", id_column), list(pump_options), format_func=pump_options.get)
+                selected_pump_id = pump_options[db_id]
                 
-                # Get selected pump data
-                selected_pump = filtered_df[filtered_df[id_column].astype(str) == selected_pump_id].iloc[0]
-                db_id = selected_pump["DB ID"]
+                # Get selected pump data by DB ID, re-reading the single row so the form shows its current values
+                selected_pump = fetch_pump_by_id(db_id)
+                if selected_pump is None:
+                    st.warning(get_text("pump_no_longer_exists", db_id))
+                    st.stop()
                 
                 # Show current Model Group
                 current_group = extract_model_group(selected_pump_id)
@@ -1208,13 +1577,13 @@ elif action == get_text("delete_pump"):
                     if success:
                         st.success(message)
                         # Clear cache to refresh data
-                        st.cache_data.clear()
+                        clear_pump_caches()
                     else:
                         st.error(message)
     
     except Exception as e:
         st.error(f"Error setting up delete form: {e}")
-        st.error(traceback.format_exc())  # This will show the detailed error in development
+        logger.exception("Error setting up delete form")
 
 # Add Bulk Delete Feature
 elif action == get_text("bulk_delete"):
@@ -1262,7 +1631,7 @@ elif action == get_text("bulk_delete"):
                             selected_category_to_delete = st.selectbox(get_text("select_category_to_delete"), categories)
                             
                             # Count records in the selected category
-                            category_df = filtered_df[filtered_df["Category"].str.lower() == selected_category_to_delete.lower()]
+                            category_df = filtered_df[match_category(filtered_df["Category"], selected_category_to_delete)]
                             record_count = len(category_df)
                             
                             st.warning(f"⚠️ {get_text('about_to_delete_category', record_count, selected_category_to_delete)}")
@@ -1311,9 +1680,9 @@ elif action == get_text("bulk_delete"):
                     # Add search to narrow down results
                     search_term = st.text_input(f"🔍 {get_text('search_by_model')}")
                     
-                    display_df = filtered_df.copy()
+                    display_df = filtered_df
                     if search_term:
-                        display_df = display_df[display_df["Model No."].astype(str).str.contains(search_term, case=False, na=False)]
+                        display_df = display_df[display_df["Model No."].str.contains(search_term, case=False, na=False, regex=False)]
                         st.write(f"{get_text('found')} {len(display_df)} {get_text('matching_pumps')}")
                     
                     # Check if we have too many records to display for manual selection
@@ -1323,10 +1692,9 @@ elif action == get_text("bulk_delete"):
                         # Create a multiselect with model numbers for selection
                         # First, create a list of options with formatted strings for better selection
                         selection_options = []
-                        for _, row in display_df.iterrows():
-                            model_no = row.get("Model No.", "Unknown")
-                            category = row.get("Category", "") if "Category" in row else ""
-                            db_id = row.get("DB ID", "")
+                        option_columns = ["Model No.", "DB ID"] + (["Category"] if "Category" in display_df.columns else [])
+                        for model_no, db_id, *rest in display_df[option_columns].itertuples(index=False, name=None):
+                            category = rest[0] if rest else ""
                             selection_text = f"{model_no} (ID: {db_id})"
                             if category:
                                 selection_text += f" - {category}"
@@ -1341,7 +1709,7 @@ elif action == get_text("bulk_delete"):
                             if selected_items:
                                 for item in selected_items:
                                     # Extract DB ID from selection text using regex
-                                    match = re.search(r"ID: (\d+)", item)
+                                    match = SELECTION_DB_ID_RE.search(item)
                                     if match:
                                         db_id = int(match.group(1))
                                         db_ids_to_delete.append(db_id)
@@ -1366,7 +1734,7 @@ elif action == get_text("bulk_delete"):
                             if error_count > 0:
                                 st.info(get_text("deleted_with_errors", success_count, error_count))
                             # Clear cache to refresh data
-                            st.cache_data.clear()
+                            clear_pump_caches()
                         else:
                             st.error(message)
                 else:
@@ -1374,8 +1742,9 @@ elif action == get_text("bulk_delete"):
     
     except Exception as e:
         st.error(f"Error setting up bulk delete form: {e}")
-        st.error(traceback.format_exc())  # This will show the detailed error in development
+        logger.exception("Error setting up bulk delete form")
 
 # --- Footer ---
 st.markdown("---")
-st.markdown(f"💧 **{get_text('app_title')}** | {get_text('last_updated')}: " + datetime.now(taiwan_tz).strftime("%Y-%m-%d %H:%M:%S"))
+loaded_at = df.attrs.get("loaded_at") or datetime.now(taiwan_tz)
+st.markdown(f"💧 **{get_text('app_title')}** | {get_text('last_updated')}: " + loaded_at.strftime("%Y-%m-%d %H:%M:%S"))
@@ -5,6 +5,9 @@ import uuid
 from datetime import datetime
 import pytz
 
+# Rows sent per insert request; PostgREST accepts a JSON array as a bulk insert
+IMPORT_CHUNK_SIZE = 500
+
 def import_csv_to_supabase(csv_file_path, supabase_client):
     """
     Import CSV data to Supabase database
@@ -24,49 +27,57 @@ def import_csv_to_supabase(csv_file_path, supabase_client):
         
         taiwan_tz = pytz.timezone('Asia/Taipei')
         
-        # Process each row
-        for index, row in df.iterrows():
-            try:
-                # Prepare record for Supabase
-                record = {}
-                
-                for column in df.columns:
-                    value = row[column]
-                    
-                    # Handle NaN values
-                    if pd.isna(value):
+        # Clean every row first so the inserts can be sent in batches
+        records = []
+        for row in df.to_dict("records"):
+            # Prepare record for Supabase
+            record = {}
+            
+            for column, value in row.items():
+                # Handle NaN values
+                if pd.isna(value):
+                    record[column] = None
+                # Handle specific data type conversions
+                elif column in ["Frequency_Hz", "Phase", "Outlet (mm)", "Pass Solid Dia(mm)"]:
+                    # Convert to integer
+                    try:
+                        record[column] = int(float(value)) if value != '' else None
+                    except (ValueError, TypeError):
+                        record[column] = None
+                elif column in ["Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
+                    # Convert to float
+                    try:
+                        record[column] = float(value) if value != '' else None
+                    except (ValueError, TypeError):
                         record[column] = None
-                    # Handle specific data type conversions
-                    elif column in ["Frequency_Hz", "Phase", "Outlet (mm)", "Pass Solid Dia(mm)"]:
-                        # Convert to integer
-                        try:
-                            record[column] = int(float(value)) if value != '' else None
-                        except (ValueError, TypeError):
-                            record[column] = None
-                    elif column in ["Max Head (M)", "Head Rated/M", "Q Rated/LPM"]:
-                        # Convert to float
-                        try:
-                            record[column] = float(value) if value != '' else None
-                        except (ValueError, TypeError):
-                            record[column] = None
-                    else:
-                        # Keep as string
-                        record[column] = str(value) if value != '' else None
-                
-                # Insert into Supabase
-                response = supabase_client.table("pump_selection_data").insert(record).execute()
-                success_count += 1
-                
-                # Show progress
-                if success_count % 50 == 0:
-                    st.write(f"Processed {success_count} records...")
-                
-            except Exception as e:
-                error_count += 1
-                errors.append(f"Row {index + 2}: {str(e)}")  # +2 because of 0-indexing and header
-                
-                if len(errors) <= 10:  # Only show first 10 errors
-                    st.error(f"Error in row {index + 2}: {str(e)}")
+                else:
+                    # Keep as string
+                    record[column] = str(value) if value != '' else None
+            
+            records.append(record)
+        
+        # Insert into Supabase, one request per chunk of rows
+        for start in range(0, len(records), IMPORT_CHUNK_SIZE):
+            chunk = records[start:start + IMPORT_CHUNK_SIZE]
+            try:
+                response = supabase_client.table("pump_selection_data").insert(chunk).execute()
+                success_count += len(chunk)
+            except Exception:
+                # Retry the chunk row by row so the failing rows can be reported
+                for offset, record in enumerate(chunk):
+                    row_number = start + offset + 2  # +2 because of 0-indexing and header
+                    try:
+                        response = supabase_client.table("pump_selection_data").insert(record).execute()
+                        success_count += 1
+                    except Exception as e:
+                        error_count += 1
+                        errors.append(f"Row {row_number}: {str(e)}")
+                        
+                        if len(errors) <= 10:  # Only show first 10 errors
+                            st.error(f"Error in row {row_number}: {str(e)}")
+            
+            # Show progress
+            st.write(f"Processed {min(start + IMPORT_CHUNK_SIZE, len(records))} records...")
         
         # Summary
         st.success(f"Import completed!")
@@ -0,0 +1,32 @@
+import streamlit as st
+from supabase import create_client, ClientOptions
+import httpx
+
+# --- Shared Supabase client for the login and the editor pages ---
+# Defined once here so every page gets the same cached client and connection pool
+@st.cache_resource(show_spinner=False)
+def init_connection():
+    try:
+        supabase_url = st.secrets["SUPABASE_URL"]
+        supabase_key = st.secrets["SUPABASE_KEY"]
+        # Share one pooled HTTP/2 client so every query reuses warm TCP/TLS connections
+        http_client = httpx.Client(
+            http2=True,
+            timeout=20.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60.0)
+        )
+        return create_client(supabase_url, supabase_key, options=ClientOptions(httpx_client=http_client))
+    except KeyError as e:
+        st.error(f"Missing required secret: {e}")
+        st.stop()
+    except Exception as e:
+        st.error(f"Failed to initialize Supabase connection: {e}")
+        st.stop()
+
+def release_auth_session(client):
+    """
+    Drop the session a sign-in stored on the shared client. supabase-py would otherwise
+    send that user's token (and keep refreshing it) on every later query, for every user
+    """
+    client.auth._remove_session()
+    client._listen_to_auth_events("SIGNED_OUT", None)
@@ -50,6 +50,7 @@ def load_translations():
             "predicted_model_group": "Predicted Model Group: {}",
             "add_pump_button": "Add Pump",
             "model_no_required": "Model No. is required.",
+            "invalid_numeric_fields": "These fields need a numeric value: {}",
             "pump_data_added": "Pump data added successfully with DB ID: {}!",
             "error_adding_pump": "Error adding pump data: {}",
             "update_pump_button": "Update Pump",
@@ -118,7 +119,22 @@ def load_translations():
             "frequency": "Frequency",
             "deleting_records": "Deleting records...",
             "deleted_all_successfully": "Successfully deleted all {} records!",
-            "last_updated": "Last updated"
+            "last_updated": "Last updated",
+            "import_csv": "Import pumps from CSV",
+            "upload_csv": "Choose a CSV file",
+            "csv_rows_found": "Found {} rows in the CSV file.",
+            "import_csv_button": "Import Pumps",
+            "importing_records": "Importing records...",
+            "imported_all_successfully": "Successfully imported all {} records!",
+            "imported_with_errors": "Imported {} records successfully with {} errors.",
+            "error_reading_csv": "Could not read the CSV file: {}",
+            "bulk_edit": "Bulk edit filtered pumps",
+            "save_bulk_edits": "Save Changes",
+            "no_changes_to_save": "No changes to save.",
+            "updating_records": "Updating records...",
+            "updated_all_successfully": "Successfully updated all {} records!",
+            "updated_with_errors": "Updated {} records successfully with {} errors.",
+            "pump_no_longer_exists": "Pump with DB ID {} no longer exists. Refresh the data to update the list."
         },
         "zh_TW": {
             "app_title": "幫浦選型資料管理器",
@@ -154,6 +170,7 @@ def load_translations():
             "predicted_model_group": "預測型號組：{}",
             "add_pump_button": "新增幫浦",
             "model_no_required": "型號為必填項。",
+            "invalid_numeric_fields": "下列欄位需要數值：{}",
             "pump_data_added": "幫浦資料成功新增，DB ID：{}！",
             "error_adding_pump": "新增幫浦資料時出錯：{}",
             "update_pump_button": "更新幫浦",
@@ -222,7 +239,22 @@ def load_translations():
             "frequency": "頻率",
             "deleting_records": "刪除記錄中...",
             "deleted_all_successfully": "成功刪除所有 {} 條記錄！",
-            "last_updated": "最後更新"
+            "last_updated": "最後更新",
+            "import_csv": "從 CSV 匯入幫浦",
+            "upload_csv": "選擇 CSV 檔案",
+            "csv_rows_found": "CSV 檔案中找到 {} 筆資料。",
+            "import_csv_button": "匯入幫浦",
+            "importing_records": "匯入記錄中...",
+            "imported_all_successfully": "成功匯入所有 {} 條記錄！",
+            "imported_with_errors": "成功匯入 {} 條記錄，有 {} 個錯誤。",
+            "error_reading_csv": "無法讀取 CSV 檔案：{}",
+            "bulk_edit": "批次編輯篩選後的幫浦",
+            "save_bulk_edits": "儲存變更",
+            "no_changes_to_save": "沒有需要儲存的變更。",
+            "updating_records": "更新記錄中...",
+            "updated_all_successfully": "成功更新所有 {} 條記錄！",
+            "updated_with_errors": "成功更新 {} 條記錄，有 {} 個錯誤。",
+            "pump_no_longer_exists": "DB ID 為 {} 的幫浦已不存在，請重新整理資料以更新清單。"
         }
     }
     
@@ -1,10 +1,6 @@
 import streamlit as st
 import extra_streamlit_components as stx
-from supabase import create_client
-
-@st.cache_resource
-def get_client():
-    return create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+from db import init_connection, release_auth_session
 
 # CookieManager must only be initialized ONCE
 cookie_manager = stx.CookieManager(key="auth_cookie")
@@ -23,13 +19,15 @@ def login_form():
                 st.error("Please enter both email and password.")
                 return
 
-            supabase = get_client()
+            supabase = init_connection()
             try:
                 result = supabase.auth.sign_in_with_password({
                     "email": email,
                     "password": password
                 })
                 if result.session:
+                    # The token lives in the cookie; keep it off the client every user shares
+                    release_auth_session(supabase)
                     # Set session token in cookie
                     cookie_manager.set("supabase_session", result.session.access_token, max_age=3600)
                     st.success("Login successful! Refreshing...")
@@ -44,7 +42,7 @@ def get_user_session():
     token = cookie_manager.get("supabase_session")
     if token:
         try:
-            supabase = get_client()
+            supabase = init_connection()
             user = supabase.auth.get_user(token)
             return user.user
         except Exception as e:
@@ -1,14 +1,15 @@
 import streamlit as st
 import pandas as pd
-from supabase import create_client
 import json
 from datetime import datetime, timedelta
-import traceback
+import logging
 from login import get_user_session
+from db import init_connection
 import pytz  # Added for timezone support
 
 # --- Define Taiwan timezone ---
 taiwan_tz = pytz.timezone('Asia/Taipei')
+logger = logging.getLogger(__name__)
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -25,19 +26,6 @@ if not user:
     st.stop()
 
 # Initialize Supabase Client
-@st.cache_resource(show_spinner=False)
-def init_connection():
-    try:
-        supabase_url = st.secrets["SUPABASE_URL"]
-        supabase_key = st.secrets["SUPABASE_KEY"]
-        return create_client(supabase_url, supabase_key)
-    except KeyError as e:
-        st.error(f"Missing required secret: {e}")
-        st.stop()
-    except Exception as e:
-        st.error(f"Failed to initialize Supabase connection: {e}")
-        st.stop()
-
 supabase = init_connection()
 
 # --- Header ---
@@ -77,7 +65,7 @@ def fetch_audit_data(table_filter=None, date_range=None, user_filter=None):
             return pd.DataFrame()
     except Exception as e:
         st.error(f"Error fetching audit data: {e}")
-        st.error(traceback.format_exc())
+        logger.exception("Error fetching audit data")
         return pd.DataFrame()
 
 # --- Get List of Tables and Users ---
@@ -249,7 +237,7 @@ try:
 
 except Exception as e:
     st.error(f"Error: {e}")
-    st.error(traceback.format_exc())
+    logger.exception("Error rendering history view")
 
 # --- Footer ---
 st.markdown("---")